@@ -5,9 +5,20 @@ from .uncertain_data_metrics import calc_metrics as eol_metrics
 from .toe_metrics import prob_success
 from .toe_profile_metrics import alpha_lambda
 
-from numpy import mean, sqrt
+from numpy import array, dot, einsum, fromiter, float64, mean, sqrt
 from warnings import warn
 
+def _mean_values(values : list):
+    """Mean of each element of values (i.e., each ToE or list of ToEs), as an array
+    """
+    try:
+        values = array(values, dtype=float64)
+    except ValueError:
+        # Elements are of different lengths
+        return fromiter((mean(x) for x in values), dtype=float64, count=len(values))
+    values = values.reshape(len(values), -1)  # One row per element
+    return einsum('ij->i', values)/values.shape[1]
+
 def mean_square_error(values : list, ground_truth : float) -> float:
     """Mean Square Error
     Args:
@@ -16,7 +27,8 @@ def mean_square_error(values : list, ground_truth : float) -> float:
     Returns:
         float: mean square error of ToE predictions
     """
-    return sum([(mean(x) - ground_truth)**2 for x in values])/len(values)
+    error = _mean_values(values) - ground_truth
+    return dot(error, error)/len(error)
 
 def root_mean_square_error(values, ground_truth):
     """Root Mean Square Error
@@ -26,7 +38,7 @@ def root_mean_square_error(values, ground_truth):
     Returns:
         float: root mean square error of ToE predictions
     """
-    return sqrt(sum([(mean(x) - ground_truth)**2 for x in values])/len(values))
+    return sqrt(mean_square_error(values, ground_truth))
 
 def percentage_in_bounds(toe : list, bounds : tuple) -> float:
     """Calculate percentage of ToE dist is within specified bounds
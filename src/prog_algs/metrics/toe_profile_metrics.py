@@ -3,10 +3,12 @@
 """
 This file includes functions for calculating metrics given a Time of Event (ToE) profile (i.e., ToE's calculated at different times of prediction resulting from running prognostics multiple times, e.g., on playback data). The metrics calculated here are specific to multiple ToE estimates (e.g. alpha-lambda metric)
 """
+from bisect import bisect_left
 from numpy import sign
 from collections import defaultdict
 from typing import Callable
 from ..predictors import ToEPredictionProfile
+from ..uncertain_data import ScalarData, UnweightedSamples
 from typing import Dict
 
 def alpha_lambda(toe_profile : ToEPredictionProfile, ground_truth : dict, lambda_value : float, alpha : float, beta : float, **kwargs) -> dict: 
@@ -21,29 +23,58 @@ def alpha_lambda(toe_profile : ToEPredictionProfile, ground_truth : dict, lambda
         beta (float): portion of prediction that must be within those bounds
         kwargs (optional): configuration arguments. Accepted args include:
             * keys (list[string], optional): list of keys to use. If not provided, all keys are used.
+            * print (bool, optional): If True, print the results. Default is False.
+            * return_combined (bool, optional): If True, return a single bool, whether the alpha-lambda was met for every key. Default is False.
 
     Returns:
-        dict: dictionary containing key value pairs for each key and whether the alpha-lambda was met.
+        dict: dictionary containing key value pairs for each key and whether the alpha-lambda was met (or bool, if return_combined is True).
     """
     params = {
-        'print': False
+        'print': False,
+        'return_combined': False
     }
     params.update(kwargs)
+    keys = params.get('keys', None)
 
-    for (t_prediction, toe) in toe_profile.items():
-        if (t_prediction >= lambda_value):
-            # If keys not provided, use all
-            keys = params.setdefault('keys', toe.keys())
-
-            bounds = {key : [gt - alpha*(gt-t_prediction), gt + alpha*(gt-t_prediction)] for key, gt in ground_truth.items()}
-            pib = toe.percentage_in_bounds(bounds)
-            result = {key: pib[key] >= beta for key in keys}
-            if params['print']:
-                for key in keys:
-                    print('\n', key)
-                    print('\ttoe:', toe.key(key))
-                    print('\tBounds: [{} - {}]({}%)'.format(bounds[key][0], bounds[key][1], pib[key]))
-            return result
+    # Find first prediction at or after lambda (times of prediction are sorted)
+    times = toe_profile.keys()
+    if not isinstance(times, list):
+        # e.g., dict_keys, for other dict-like profiles
+        times = list(times)
+    index = bisect_left(times, lambda_value)
+    if index == len(times):
+        # No prediction at or after lambda
+        return None
+    t_prediction = times[index]
+    toe = toe_profile[t_prediction]
+
+    if keys is None:
+        # If keys not provided, use all
+        keys = toe.keys()
+
+    bounds = {}
+    for key in keys:
+        gt = ground_truth[key]
+        bound_width = alpha*(gt-t_prediction)
+        bounds[key] = [gt - bound_width, gt + bound_width]
+
+    if params['return_combined'] and not params['print'] and isinstance(toe, (UnweightedSamples, ScalarData)):
+        # Stop at the first key that fails. Only done where calculating per key is cheap and deterministic- other distributions are sampled with each call
+        for key in keys:
+            if toe.percentage_in_bounds(bounds, [key])[key] < beta:
+                return False
+        return True
+
+    pib = toe.percentage_in_bounds(bounds, keys)  # Calculated once, shared by result and print
+    result = {key: pib[key] >= beta for key in keys}
+    if params['print']:
+        for key in keys:
+            print('\n', key)
+            print('\ttoe:', toe.key(key))
+            print('\tBounds: [{} - {}]({}%)'.format(bounds[key][0], bounds[key][1], pib[key]))
+    if params['return_combined']:
+        return all(result.values())
+    return result
 
 def prognostic_horizon(toe_profile : ToEPredictionProfile, criteria_eqn : Callable, ground_truth : dict, **kwargs) -> dict:
     """
@@ -70,6 +101,7 @@ def prognostic_horizon(toe_profile : ToEPredictionProfile, criteria_eqn : Callab
     params.update(kwargs)
 
     ph_result = {k:None for k in ground_truth.keys()} # False means not yet met; will be either a numerical value or None if met
+    n_unmet = len(ph_result)  # Number of events whose horizon has not been found
     for (t_prediction, toe) in toe_profile.items():
         # Convert to TtE for toe and ground_truth
         tte = toe - t_prediction
@@ -78,13 +110,14 @@ def prognostic_horizon(toe_profile : ToEPredictionProfile, criteria_eqn : Callab
         # Pass to criteria_eqn
         criteria_eqn_dict = criteria_eqn(tte, ground_truth_tte) # -> dict[event_names as str, bool]
         for k,v in criteria_eqn_dict.items():
-            if v and (ph_result[k] == None):
+            if v and (ph_result[k] is None):
                 ph_calc = ground_truth[k] - t_prediction
                 if ph_calc > 0:
                     ph_result[k] = ph_calc # PH = EOL - ti # ground truth is a dictionary {'EOD': 3005.2} should be ph_result[k] = g_truth[key] - t_prediction
-                if (all(v != None for v in ph_result.values())):
-                    # Return PH once all criteria are met
-                    return ph_result
+                    n_unmet -= 1
+                    if n_unmet == 0:
+                        # Return PH once all criteria are met
+                        return ph_result
     # Return PH when criteria not met for at least one event key
     return ph_result
 
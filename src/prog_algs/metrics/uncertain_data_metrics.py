@@ -3,9 +3,9 @@
 """
 This file includes functions for calculating general metrics (i.e. mean, std, percentiles, etc.) on any distribution of type UncertainData (e.g. states, event_states, an EOL distribution, etc.)
 """
+from functools import lru_cache
 from typing import Iterable, Union
-from numpy import isscalar, mean, std, array
-from scipy import stats
+from numpy import count_nonzero, isscalar, array, ndarray, partition, dot, sqrt
 from warnings import warn
 from ..uncertain_data import UncertainData, UnweightedSamples
 
@@ -22,6 +22,10 @@ def calc_metrics(data : UncertainData, ground_truth : Union[float, dict] = None,
     Returns:
         dict: collection of metrics
     """
+    if isinstance(data, ndarray) and data.ndim == 1 and data.size > 0 and data.dtype.kind in 'iuf':
+        # Fast path for arrays of numbers- no conversion or None filtering needed
+        return _calc_metrics_scalar(data, ground_truth)
+
     params = {
         'n_samples': 10000,  # Default is enough to get every percentile
     }
@@ -43,15 +47,19 @@ def calc_metrics(data : UncertainData, ground_truth : Union[float, dict] = None,
             samples = data.sample(params['n_samples'])
 
         # If unweighted_samples, calculate metrics for each key
-        result = {key: calc_metrics(samples.key(key), 
-                ground_truth if not ground_truth else ground_truth[key],  # If ground_truth is a dict, use key
-                **kwargs) for key in keys}
+        result = {}
+        for key in keys:
+            key_ground_truth = ground_truth if not ground_truth else ground_truth[key]  # If ground_truth is a dict, use key
+            result[key] = calc_metrics(samples.key(key), key_ground_truth, **kwargs)
 
         # Set values specific to distribution
-        for key in keys:
-            result[key]['mean'] = data.mean[key]
-            result[key]['median'] = data.median[key]
-            result[key]['percentiles']['50'] = data.median[key]
+        if len(result) > 0:
+            data_mean = data.mean
+            data_median = data.median
+            for key in keys:
+                result[key]['mean'] = data_mean[key]
+                result[key]['median'] = data_median[key]
+                result[key]['percentiles']['50'] = data_median[key]
 
         return result
     elif isinstance(data, Iterable):
@@ -71,39 +79,57 @@ def calc_metrics(data : UncertainData, ground_truth : Union[float, dict] = None,
         raise TypeError("Data must be type Uncertain Data or array of dicts, was {}".format(type(data)))
 
     # If we get here then Data is a list of numbers- calculate metrics for numbers
-    data_abridged = array([d for d in data if d is not None]) # Must be array
+    data_abridged = array(data)
+    if data_abridged.dtype.kind not in 'biuf':
+        # Some samples are None (i.e., event not reached)
+        data_abridged = array([d for d in data if d is not None]) # Must be array
     if len(data_abridged) == 0:
         raise ValueError('All samples were none')
     if len(data_abridged) < len(data):
         warn("Some samples were None, resulting metrics only consider non-None samples. Note: in some cases, this will bias the metrics.")
-    data_abridged.sort()
-    m = mean(data_abridged)
-    median = data_abridged[int(len(data_abridged)/2)]
+    return _calc_metrics_scalar(data_abridged, ground_truth)
+
+@lru_cache(maxsize=32)
+def _order_statistic_indices(n : int) -> tuple:
+    """Indices (in sorted order) of the min, 0.01, 0.1, 1, 10, 25, 50, and 75th percentiles, and max for n samples"""
+    return (0, n//10000, n//1000, n//100, n//10, n//4, n//2, 3*n//4, n-1)
+
+def _calc_metrics_scalar(data : ndarray, ground_truth : float = None) -> dict:
+    """Calculate metrics for a non-empty array of numbers (see calc_metrics)"""
+    n = len(data)
+    indices = _order_statistic_indices(n)
+    # Only a few order statistics are needed, so partition around them (O(n)) instead of sorting (O(n log n)), then gather them all at once
+    (min_value, p0_01, p0_1, p1, p10, p25, median, p75, max_value) = partition(data, indices)[list(indices)].tolist()
+    m = data.mean()
+    deviation = data - m  # Shared by std and mean absolute deviation
     metrics = {
-        'min': data_abridged[0],
+        'min': min_value,
         'percentiles': {
-            '0.01': data_abridged[int(len(data_abridged)/10000)] if len(data_abridged) >= 10000 else None,
-            '0.1': data_abridged[int(len(data_abridged)/1000)] if len(data_abridged) >= 1000 else None,
-            '1': data_abridged[int(len(data_abridged)/100)] if len(data_abridged) >= 100 else None,
-            '10': data_abridged[int(len(data_abridged)/10)] if len(data_abridged) >= 10 else None,
-            '25': data_abridged[int(len(data_abridged)/4)] if len(data_abridged) >= 4 else None,
+            '0.01': p0_01 if n >= 10000 else None,
+            '0.1': p0_1 if n >= 1000 else None,
+            '1': p1 if n >= 100 else None,
+            '10': p10 if n >= 10 else None,
+            '25': p25 if n >= 4 else None,
             '50': median,
-            '75': data_abridged[int(3*len(data_abridged)/4)] if len(data_abridged) >= 4 else None,
+            '75': p75 if n >= 4 else None,
         },
         'median': median,
         'mean': m,
-        'std': std(data_abridged),
-        'max': data_abridged[-1],
-        'median absolute deviation': sum([abs(x - median) for x in data_abridged])/len(data_abridged),
-        'mean absolute deviation':   sum([abs(x - m)   for x in data_abridged])/len(data_abridged),
-        'number of samples': len(data_abridged)
+        'std': sqrt(dot(deviation, deviation)/n),
+        'max': max_value,
+        'median absolute deviation': abs(data - median).mean(),
+        'mean absolute deviation':   abs(deviation).mean(),
+        'number of samples': n
     }
 
     if ground_truth is not None:
         # Metrics comparing to ground truth
-        metrics['mean absolute error'] = sum([abs(x - ground_truth) for x in data_abridged])/len(data_abridged)
+        metrics['mean absolute error'] = abs(data - ground_truth).mean()
         metrics['mean absolute percentage error'] = metrics['mean absolute error']/ ground_truth
         metrics['relative accuracy'] = 1 - abs(ground_truth - metrics['mean'])/ground_truth
-        metrics['ground truth percentile'] = stats.percentileofscore(data_abridged, ground_truth)
+        # Equivalent to scipy.stats.percentileofscore(data, ground_truth) (kind='rank'), without requiring sorted data
+        n_below = count_nonzero(data < ground_truth)
+        n_at_or_below = count_nonzero(data <= ground_truth)
+        metrics['ground truth percentile'] = (n_below + n_at_or_below + (n_at_or_below > n_below)) * 50 / n
 
     return metrics
@@ -2,9 +2,12 @@
 
 from .prediction import UnweightedSamplesPrediction, PredictionResults
 from .predictor import Predictor
-from copy import deepcopy
+from contextlib import nullcontext
+from multiprocessing import Pool, cpu_count
+from numpy import random
 from typing import Callable
 from prog_models.sim_result import SimResult, LazySimResult
+from prog_models.utils.containers import DictLikeMatrixWrapper
 from prog_algs.uncertain_data import UnweightedSamples, UncertainData
 
 
@@ -32,10 +35,13 @@ class MonteCarlo(Predictor):
         Frequency at which results are saved (s)
     save_pts : List[float]
         Any additional savepoints (s) e.g., [10.1, 22.5]
+    cores : int or None
+        Number of processes to distribute samples across. Defaults to 1 (no multiprocessing). None uses every available core. When greater than 1, the model, future loading equation, and results must be picklable.
     """
 
     default_parameters = { 
-        'n_samples': 100  # Default number of samples to use, if none specified
+        'n_samples': 100,  # Default number of samples to use, if none specified
+        'cores': 1  # Number of processes to use
     }
 
     def predict(self, state : UncertainData, future_loading_eqn : Callable, **kwargs) -> PredictionResults:
@@ -47,8 +53,8 @@ class MonteCarlo(Predictor):
         else:
             raise TypeError("state must be UncertainData, dict, or StateContainer")
 
-        params = deepcopy(self.parameters) # copy parameters
-        params.update(kwargs) # update for specific run
+        # Shallow copy is enough- nested values (e.g., events, save_pts) are only read, never modified
+        params = {**self.parameters, **kwargs} # copy parameters, updated for specific run
         params['print'] = False
         params['progress'] = False
 
@@ -59,107 +65,55 @@ class MonteCarlo(Predictor):
         if not isinstance(state, UnweightedSamples) or len(state) != params['n_samples']:
             state = state.sample(params['n_samples'])
 
-        es_eqn = self.model.event_state
-        tm_eqn = self.model.threshold_met
-        simulate_to_threshold = self.model.simulate_to_threshold
+        # t0, horizon, and x are given separately for each sample (see _predict_sample), so they are not included with the other simulation parameters
+        t0 = params.pop('t0', 0)
+        horizon = params.pop('horizon', float('inf'))
+        params.pop('x', None)
+        if 'save_freq' in params and not isinstance(params['save_freq'], tuple):
+            params['save_freq'] = (t0, params['save_freq'])
 
-        time_of_event_all = []
-        last_states = []
-        times_all = []
-        inputs_all = []
-        states_all = []
-        outputs_all = []
-        event_states_all = []
+        if params['cores'] is None:
+            params['cores'] = cpu_count()
+        # Never start more processes than there are samples
+        params['cores'] = min(params['cores'], len(state))
+
+        # Results for each sample, stored by sample index
+        n_samples = len(state)
+        (times_all, inputs_all, states_all, outputs_all, event_states_all, time_of_event_all) = ([None] * n_samples for _ in range(6))
+        final_states = {event: [None] * n_samples for event in params['events']}  # State at each event, by event
 
         # Perform prediction
-        for x in state:
-            first_output = self.model.output(x)
-            
-            time_of_event = {}
-            last_state = {}
-
-            t0 = params.get('t0', 0)
-            if 'save_freq' in params and not isinstance(params['save_freq'], tuple):
-                params['save_freq'] = (t0, params['save_freq'])
-            
-            if len(params['events']) == 0:  # Predict to time
-                (times, inputs, states, outputs, event_states) = simulate_to_threshold(future_loading_eqn,       
-                    first_output, 
-                    threshold_keys = [],
-                    t0 = t0, 
-                    x = x, 
-                    **params
-                )
+        with (Pool(params['cores'], initializer = _init_worker, initargs = (self.model, params, future_loading_eqn, t0, horizon)) if params['cores'] > 1 else nullcontext()) as p:
+            if p is None:
+                results = ((i, _predict_sample(self.model, params, future_loading_eqn, t0, horizon, x)) for (i, x) in enumerate(state))
             else:
-                events_remaining = params['events'].copy()
-
-                times = []
-                inputs = SimResult(_copy = False)
-                states = SimResult(_copy = False)
-                outputs = LazySimResult(fcn = self.model.output, _copy = False)
-                event_states = LazySimResult(fcn = es_eqn, _copy = False)
-
-                # Non-vectorized prediction
-                while len(events_remaining) > 0:  # Still events to predict
-                    (t, u, xi, z, es) = simulate_to_threshold(future_loading_eqn,       
-                        first_output, 
-                        threshold_keys = events_remaining,
-                        t0 = t0, 
-                        x = x, 
-                        **params
-                    )
-
-                    # Add results
-                    times.extend(t)
-                    inputs.extend(u)
-                    states.extend(xi)
-                    outputs.extend(z, _copy = False)
-                    event_states.extend(es, _copy = False)
-
-                    # Get which event occurs
-                    t_met = tm_eqn(states[-1])
-                    t_met = {key: t_met[key] for key in events_remaining}  # Only look at remaining keys
-
-                    try:
-                        event = list(t_met.keys())[list(t_met.values()).index(True)]
-                    except ValueError:
-                        # no event has occured - hit horizon
-                        for event in events_remaining:
-                            time_of_event[event] = None
-                            last_state[event] = None
-                        break
-
-                    # An event has occured
-                    time_of_event[event] = times[-1]
-                    events_remaining.remove(event)  # No longer an event to predect to
-
-                    # Remove last state (event)
-                    t0 = times.pop()
-                    inputs.pop()
-                    x = states.pop()
-                    last_state[event] = x.copy()
-                    outputs.pop()
-                    event_states.pop()
-            
-            # Add to "all" structures
-            if len(times) > len(times_all): # Keep longest
-                times_all = times
-            inputs_all.append(inputs)
-            states_all.append(states)
-            outputs_all.append(outputs)
-            event_states_all.append(event_states)
-            time_of_event_all.append(time_of_event)
-            last_states.append(last_state)
-              
+                # Samples are sent to workers in chunks, tagged with their index so results can be put back in order
+                chunksize = max(1, n_samples // (params['cores'] * 4))
+                results = p.imap_unordered(_predict_sample_worker, enumerate(state), chunksize = chunksize)
+            for (i, (times, inputs, states, time_of_event_all[i], last_state)) in results:
+                # Results are wrapped here instead of in _predict_sample, so the model is not pickled back with every sample from the workers
+                if p is not None:
+                    # Inputs are pickled as DictLikeMatrixWrapper, so they are converted back to the model's InputContainer. Saved states are already DictLikeMatrixWrapper, as in the serial case
+                    inputs = [_as_container(u, self.model.InputContainer) for u in inputs]
+                times_all[i] = times
+                inputs_all[i] = SimResult(times, inputs, _copy = False)
+                states_all[i] = SimResult(times, states, _copy = False)
+                outputs_all[i] = LazySimResult(fcn = self.model.output, times = times, states = states.copy(), _copy = False)
+                event_states_all[i] = LazySimResult(fcn = self.model.event_state, times = times, states = states.copy(), _copy = False)
+                for (event, x_event) in last_state.items():
+                    final_states[event][i] = x_event
+
+        times_all = max(times_all, key=len, default=[])  # Keep longest (first, if tied)
+
         inputs_all = UnweightedSamplesPrediction(times_all, inputs_all)
         states_all = UnweightedSamplesPrediction(times_all, states_all)
         outputs_all = UnweightedSamplesPrediction(times_all, outputs_all)
         event_states_all = UnweightedSamplesPrediction(times_all, event_states_all)
         time_of_event = UnweightedSamples(time_of_event_all)
 
-        # Transform final states:
+        # Final states (already grouped by event)
         time_of_event.final_state = {
-            key: UnweightedSamples([sample[key] for sample in last_states], _type = self.model.StateContainer) for key in time_of_event.keys()
+            event: UnweightedSamples(final_states[event], _type = self.model.StateContainer) for event in time_of_event.keys()
         }
 
         return PredictionResults(
@@ -170,3 +124,97 @@ class MonteCarlo(Predictor):
             event_states_all, 
             time_of_event
         )
+
+
+def _predict_sample(model, params : dict, future_loading_eqn : Callable, t0 : float, horizon : float, x) -> tuple:
+    """Simulate a single state sample until every event has occured or the horizon is reached. params is shared between samples, and is not modified
+
+    Returns:
+        tuple: (times, inputs, states, time_of_event, last_state) for the sample, where times, inputs, and states are lists
+    """
+    time_of_event = {}
+    last_state = {}
+
+    if len(params['events']) == 0:  # Predict to time
+        (times, inputs, states, _, _) = model.simulate_to_threshold(future_loading_eqn,
+            threshold_keys = [],
+            t0 = t0,
+            x = x,
+            horizon = horizon,
+            **params
+        )
+        (times, inputs, states) = (list(times), inputs.data, states.data)
+    else:
+        simulate_to_threshold = model.simulate_to_threshold
+        events_remaining = params['events'].copy()
+        horizon += t0  # Time at which prediction stops, even if events remain
+
+        # Results are accumulated in lists
+        times = []
+        inputs = []
+        states = []
+
+        # Non-vectorized prediction
+        while len(events_remaining) > 0:  # Still events to predict
+            if t0 >= horizon:
+                # no time left to predict remaining events
+                for event in events_remaining:
+                    time_of_event[event] = None
+                    last_state[event] = None
+                break
+
+            # Horizon is relative to the start of each simulation, so it is reduced by the time already predicted
+            # Note: first_output is not provided, it is only used to initialize the state when x is not given
+            (t, u, xi, z, es) = simulate_to_threshold(future_loading_eqn,
+                threshold_keys = events_remaining,
+                t0 = t0,
+                x = x,
+                horizon = horizon - t0,
+                **params
+            )
+
+            # Add results (outputs and event states are calculated from states, when needed)
+            times.extend(t)
+            inputs.extend(u.data)
+            states.extend(xi.data)
+
+            # Get which event occurs
+            t_met = model.threshold_met(states[-1])
+            event = next((key for key in events_remaining if t_met[key]), None)  # Only look at remaining keys
+
+            if event is None:
+                # no event has occured - hit horizon
+                for event in events_remaining:
+                    time_of_event[event] = None
+                    last_state[event] = None
+                break
+
+            # An event has occured
+            time_of_event[event] = times[-1]
+            events_remaining.remove(event)  # No longer an event to predect to
+
+            # Remove last state (event)
+            t0 = times.pop()
+            inputs.pop()
+            x = states.pop()
+            last_state[event] = x.copy()
+
+    return (times, inputs, states, time_of_event, last_state)
+
+def _as_container(data, container : type):
+    """Wrap a DictLikeMatrixWrapper (e.g., returned from a worker) as the given container type, without copying. Other data (e.g., None or dict) is returned unchanged"""
+    if isinstance(data, DictLikeMatrixWrapper) and not isinstance(data, container):
+        return container(data.matrix)
+    return data
+
+# Per-process configuration for multiprocessing, set once by _init_worker instead of being sent with every sample
+_worker_args = None
+
+def _init_worker(model, params : dict, future_loading_eqn : Callable, t0 : float, horizon : float) -> None:
+    global _worker_args
+    random.seed()  # Forked workers inherit the same random state, which would repeat process noise across workers
+    _worker_args = (model, params, future_loading_eqn, t0, horizon)
+
+def _predict_sample_worker(indexed_sample : tuple) -> tuple:
+    (i, x) = indexed_sample
+    return (i, _predict_sample(*_worker_args, x))
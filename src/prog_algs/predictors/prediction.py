@@ -2,7 +2,7 @@
 
 from collections import UserList, defaultdict, namedtuple
 from typing import Dict
-from numpy import sign
+from numpy import array, float64, isnan, sign
 from warnings import warn
 
 from ..uncertain_data import UnweightedSamples, UncertainData
@@ -20,6 +20,7 @@ class Prediction():
         data (list[UncertainData]):
             Data points for each time in times 
     """
+    __slots__ = ('times', 'data')  # Avoid per-instance __dict__ (note: subclasses, e.g., UnweightedSamplesPrediction, may still have one)
 
     def __init__(self, times : list, data : list):
         self.times = times
@@ -112,26 +113,57 @@ class UnweightedSamplesPrediction(Prediction, UserList):
 
     def __init__(self, times : list, data : list):
         super(UnweightedSamplesPrediction, self).__init__(times, data)
-        self.__transformed = False  # If transform has been calculated
+        self.__transform = {}  # Cache of calculated snapshots, by time index
+        self.__values = None  # Cached (sample, time, key) array of all data (see __values_array)
 
-    def __calculate_tranform(self):
+    def __values_array(self):
         """
-        Calculate tranform of the data from data[sample_id][time_id] to data[time_id][sample_id]. Result is cached as self.__transform and is used in methods which look at a snapshot for a specific time
+        Get all data as a single (sample, time, key) array, calculated once and cached.
+
+        Returns:
+            tuple(list, ndarray) or None: keys and array of values, or None if samples do not all reach every time or values are not all numbers
+        """
+        if self.__values is None:
+            self.__values = (None, None)
+            if len(self.data) > 0 and len(self.data[0]) > 0 and all(len(sample) == len(self.times) for sample in self.data):
+                keys = list(self.data[0][0].keys())
+                try:
+                    # Index by key, since data points are not guaranteed to all have the same key order
+                    values = array([[[datem[key] for key in keys] for datem in sample] for sample in self.data], dtype=float64)
+                except (KeyError, ValueError, TypeError):
+                    # Keys are not the same for every data point, or values are not all numbers (e.g., None) or not all the same shape
+                    values = None
+                if values is not None and values.ndim == 3 and values.shape[2] == len(keys) and not isnan(values).any():
+                    self.__values = (keys, values)
+        return self.__values if self.__values[1] is not None else None
+
+    def __calculate_tranform(self, time_index : int) -> UnweightedSamples:
         """
-        # Lazy calculation of tranform - only if needed
+        Calculate tranform of the data from data[sample_id][time_id] to data[time_id][sample_id] for a single time index. Result is not cached
+        """
+        values = self.__values_array()
+        if values is not None:
+            # Slice the column for each key from the array of all data
+            (keys, values) = values
+            return UnweightedSamples({key: values[:, time_index, i] for (i, key) in enumerate(keys)})
+
         # Note: prediction stops when event is reached, so for the length of all will not be the same. 
         # If the prediction doesn't go this far, then the value is set to None
-        self.__transform = [UnweightedSamples([sample[time_index] if len(sample) > time_index else None for sample in self.data]) for time_index in range(len(self.times))]
-        self.__transformed = True
+        return UnweightedSamples([sample[time_index] if len(sample) > time_index else None for sample in self.data])
 
     def __str__(self) -> str:
         return "UnweightedSamplesPrediction with {} savepoints".format(len(self.times))
 
     @property
     def mean(self) -> list:
-        if not self.__transformed:
-            self.__calculate_tranform()
-        return [dist.mean for dist in self.__transform]
+        values = self.__values_array()
+        if values is not None:
+            # Every sample reaches every time- average all samples at once
+            (keys, values) = values
+            return [dict(zip(keys, mean_t)) for mean_t in values.mean(axis=0).tolist()]
+
+        # Snapshots that are not already cached are only needed long enough to calculate their mean
+        return [(self.__transform[time_index] if time_index in self.__transform else self.__calculate_tranform(time_index)).mean for time_index in range(len(self.times))]
 
     def sample(self, sample_id : int):
         warn("Deprecated. Please use prediction[sample_id] instead.")
@@ -146,8 +178,10 @@ class UnweightedSamplesPrediction(Prediction, UserList):
         Returns:
             UnweightedSamples: Samples for time corresponding to times[timestep]
         """
-        if not self.__transformed:
-            self.__calculate_tranform()
+        # Lazy calculation of tranform - only for the times requested
+        time_index = range(len(self.times))[time_index]  # Normalize negative indices (and raise IndexError if out of range)
+        if time_index not in self.__transform:
+            self.__transform[time_index] = self.__calculate_tranform(time_index)
         return self.__transform[time_index]
 
     def __not_implemented(self, *args, **kw):
@@ -1,6 +1,7 @@
 # Copyright © 2021 United States Government as represented by the Administrator of the National Aeronautics and Space Administration. All Rights Reserved.
 import matplotlib.pyplot as plt
-from collections import UserDict
+from bisect import bisect_left
+from collections import OrderedDict, UserDict
 from typing import Dict
 import numpy as np
 
@@ -9,7 +10,24 @@ from prog_algs.uncertain_data import UncertainData
 class ToEPredictionProfile(UserDict):
     """
     Data structure for storing the result of multiple predictions, including time of prediction. This data structure can be treated as a dictionary of time of prediction to Time of Event (ToE) prediction. Iteration of this data structure is in order of increasing time of prediction
+
+    Results of the alpha_lambda, prognostic_horizon, and cumulative_relative_accuracy methods are cached until a prediction is added or removed. Predictions should not be modified in place after being added.
     """
+    __sorted_keys = None  # Cache of times of prediction in increasing order (tuple, so it can be shared without copying), reset when the profile changes
+    __metric_cache = None  # Cache of metric results by arguments (most recently used last), reset when the profile changes
+    __metric_cache_size = 16  # Maximum number of metric results cached
+
+    def __init__(self, *args, **kwargs):
+        self.__metric_cache = OrderedDict()
+        super(ToEPredictionProfile, self).__init__(*args, **kwargs)
+
+    def __getstate__(self):
+        # Caches are not pickled- they are recalculated when needed (and cached metrics may be keyed by functions that cannot be pickled)
+        state = self.__dict__.copy()
+        state.pop('_ToEPredictionProfile__sorted_keys', None)
+        state.pop('_ToEPredictionProfile__metric_cache', None)
+        return state
+
     def add_prediction(self, time_of_prediction: float, toe_prediction: UncertainData):
         """Add a single prediction to the profile
 
@@ -19,27 +37,94 @@ class ToEPredictionProfile(UserDict):
         """
         self[time_of_prediction] = toe_prediction
 
+    def __copy__(self):
+        inst = super(ToEPredictionProfile, self).__copy__()
+        # Caches describe this profile's predictions, so are not shared with the copy
+        inst.__sorted_keys = None
+        inst.__metric_cache = OrderedDict()
+        return inst
+
+    def __setitem__(self, key, value):
+        if self.__sorted_keys is not None and key not in self.data:
+            # Insert new time in order. A new tuple is created so any iteration in progress is unaffected
+            index = bisect_left(self.__sorted_keys, key)
+            if index == len(self.__sorted_keys) or self.__sorted_keys[index] != key:
+                self.__sorted_keys = self.__sorted_keys[:index] + (key,) + self.__sorted_keys[index:]
+        self.__metric_cache = OrderedDict()
+        super(ToEPredictionProfile, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super(ToEPredictionProfile, self).__delitem__(key)
+        if self.__sorted_keys is not None:
+            index = bisect_left(self.__sorted_keys, key)
+            self.__sorted_keys = self.__sorted_keys[:index] + self.__sorted_keys[index+1:]
+        self.__metric_cache = OrderedDict()
+
+    if hasattr(UserDict, '__ior__'):  # Python 3.9+
+        def __ior__(self, other):
+            # Updates data directly (without __setitem__), so caches must be reset here
+            result = super(ToEPredictionProfile, self).__ior__(other)
+            self.__sorted_keys = None
+            self.__metric_cache = OrderedDict()
+            return result
+
+    def _sorted_times(self) -> tuple:
+        """
+        Get the times of prediction in increasing order, without copying. Unlike keys(), the result is shared, so it is read-only
+        """
+        if self.__sorted_keys is None or len(self.__sorted_keys) != len(self.data):
+            # Not calculated yet, or data was changed without __setitem__/__delitem__
+            self.__sorted_keys = tuple(sorted(self.data))
+        return self.__sorted_keys
+
+    def __cached_metric(self, metric, *args, **kwargs):
+        """Calculate metric for this profile, reusing the result of an earlier call with the same arguments if the profile has not changed since"""
+        if kwargs.get('print', False):
+            # Printing is a side effect of calculating, so always calculate
+            return metric(self, *args, **kwargs)
+        if self.__metric_cache is None:
+            # e.g., unpickled profile
+            self.__metric_cache = OrderedDict()
+        try:
+            cache_key = (metric, _hashable(args), _hashable(kwargs))
+            result = self.__metric_cache.get(cache_key)
+        except TypeError:
+            # Unhashable argument, cannot cache
+            return metric(self, *args, **kwargs)
+        if result is None:
+            result = metric(self, *args, **kwargs)
+            if result is None:
+                return None
+            self.__metric_cache[cache_key] = result
+            if len(self.__metric_cache) > self.__metric_cache_size:
+                self.__metric_cache.popitem(last = False)  # Discard least recently used
+        else:
+            self.__metric_cache.move_to_end(cache_key)
+        if isinstance(result, dict):
+            return result.copy()  # Copy so changes by the caller do not affect the cache
+        return result
+
     # Functions below are defined to ensure that any iteration is in order of increasing time of prediction
     def __iter__(self):
-        return iter(sorted(super(ToEPredictionProfile, self).__iter__()))
+        return iter(self._sorted_times())
 
     def items(self):
         """
         Get iterators for the items (time_of_prediction, toe_prediction) of the prediction profile
         """
-        return iter((k, self[k]) for k in self)
+        return iter((k, self.data[k]) for k in self._sorted_times())
 
     def keys(self):
         """
         Get iterator for the keys (i.e., time_of_prediction) of the prediction profile
         """
-        return sorted(super(ToEPredictionProfile, self).keys())
+        return list(self._sorted_times())
 
     def values(self):
         """
         Get iterator for the values (i.e., toe_prediction) of the prediction profile
         """
-        return [self[k] for k in self.keys()]
+        return iter(self.data[k] for k in self._sorted_times())
 
     def alpha_lambda(self, ground_truth : Dict[str, float], lambda_value : float, alpha : float, beta : float, **kwargs) -> Dict[str, bool]:
         """Calculate Alpha lambda metric for the prediction profile
@@ -57,12 +142,13 @@ class ToEPredictionProfile(UserDict):
                 configuration arguments. Accepted arge include: \n
                  * keys (list[string]): list of keys to use. If not provided, all keys are used.
                  * print (bool) : If True, print the results. Default is False.
+                 * return_combined (bool): If True, return whether alpha lambda was met for every key, stopping at the first key where it was not. Default is False.
 
         Returns:
-            Dict[str, bool]: If alpha lambda was met for each key (e.g., {'event1': True, 'event2', False, ...})
+            Dict[str, bool]: If alpha lambda was met for each key (e.g., {'event1': True, 'event2', False, ...}), or bool if return_combined is True
         """
         from ..metrics import alpha_lambda
-        return alpha_lambda(self, ground_truth, lambda_value, alpha, beta, **kwargs)
+        return self.__cached_metric(alpha_lambda, ground_truth, lambda_value, alpha, beta, **kwargs)
 
     def prognostic_horizon(self, criteria_eqn, ground_truth, **kwargs) -> Dict[str, float]:
         """
@@ -84,7 +170,7 @@ class ToEPredictionProfile(UserDict):
             dict: Dictionary containing prognostic horizon calculations (value) for each event (key). e.g., {'event1': 12.3, 'event2': 15.1}
         """
         from ..metrics import prognostic_horizon
-        return prognostic_horizon(self, criteria_eqn, ground_truth, **kwargs)
+        return self.__cached_metric(prognostic_horizon, criteria_eqn, ground_truth, **kwargs)
 
     def cumulative_relative_accuracy(self, ground_truth, **kwargs) -> Dict[str, float]:
         """
@@ -100,7 +186,7 @@ class ToEPredictionProfile(UserDict):
             dict: Dictionary containing cumulative relative accuracy (value) for each event (key). e.g., {'event1': 12.3, 'event2': 15.1}
         """
         from ..metrics import cumulative_relative_accuracy
-        return cumulative_relative_accuracy(self, ground_truth, **kwargs)
+        return self.__cached_metric(cumulative_relative_accuracy, ground_truth, **kwargs)
 
     def monotonicity(self, **kwargs) -> Dict[str, float]:
         """Calculate monotonicty for a prediction profile. 
@@ -137,6 +223,7 @@ class ToEPredictionProfile(UserDict):
                 Collection of generated matplotlib figures for each event in profile
         """
         result_figs = {}
+        scatter_data = {}  # Samples for each event, as (times of prediction, times to event), plotted together once all predictions are sampled
         for t,v in self.items():
             raw_samples = v.sample(100) # sample distribution (red scatter plot)
             for key in v.keys():
@@ -149,19 +236,36 @@ class ToEPredictionProfile(UserDict):
                     fig_sub.set_xlabel('Time of Prediction (s)') # time to prediction
                     fig_sub.set_ylabel('Time to Event (s)') # time to event
                     result_figs[key] = fig_window
-                # Create scatter plot for this event
-                samples = [e[key]-t for e in raw_samples]
-                result_figs[key].get_axes()[0].scatter([t]*len(samples), samples, color='red') # Adding single distribution of estimates
+                    scatter_data[key] = ([], [])
+                # Add single distribution of estimates for this event
+                samples = np.array(raw_samples.key(key), dtype=np.float64) - t  # Events that are not reached (None) are not plotted
+                scatter_data[key][0].append(np.full(len(samples), t))
+                scatter_data[key][1].append(samples)
+
+        # Create scatter plot for each event
+        for key, (times, samples) in scatter_data.items():
+            result_figs[key].get_axes()[0].scatter(np.concatenate(times), np.concatenate(samples), color='red')
 
         if ground_truth: # If ground_truth is specified, add ground_truth to each event plot (green line)
             for key, val in ground_truth.items():
-                gt_x = range(int(val))
-                gt_y = range(int(val), 0, -1)
-                result_figs[key].get_axes()[0].plot(gt_x, gt_y, color='green')
+                gt_x = np.arange(int(val))
+                gt_y = np.arange(int(val), 0, -1)
+                ax = result_figs[key].get_axes()[0]
+                ax.plot(gt_x, gt_y, color='green')
                 if alpha: # if ground_truth and alpha are specified, add alpha bounds (faded green highlight)
-                    result_figs[key].get_axes()[0].fill_between(gt_x, np.array(gt_y)*(1-alpha), np.array(gt_y)*(1+alpha), color='green', alpha=0.2)
-                result_figs[key].get_axes()[0].set_xlim(0, val+1)
+                    ax.fill_between(gt_x, gt_y*(1-alpha), gt_y*(1+alpha), color='green', alpha=0.2)
+                ax.set_xlim(0, val+1)
 
         if show: # Optionally not display plots and just return plot objects
             plt.show()
         return result_figs 
+
+
+def _hashable(value):
+    """Convert metric arguments (e.g., dicts of ground truth, lists of keys) into a hashable form for caching"""
+    if isinstance(value, dict):
+        return tuple((key, _hashable(v)) for key, v in sorted(value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(v) for v in value)
+    hash(value)  # Raises TypeError if unhashable
+    return value
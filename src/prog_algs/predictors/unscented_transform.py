@@ -3,10 +3,11 @@
 from typing import Callable
 from .prediction import Prediction, UnweightedSamplesPrediction, PredictionResults
 from .predictor import Predictor
-from numpy import diag, array, transpose, isnan
+from numpy import broadcast_to, diag, array, empty, float64, fromiter, full, isnan
 from copy import deepcopy
 from filterpy import kalman
 from prog_algs.uncertain_data import MultivariateNormalDist, UncertainData, ScalarData
+from prog_models.utils.containers import DictLikeMatrixWrapper
 
 
 class LazyUTPrediction(Prediction):
@@ -18,31 +19,44 @@ class LazyUTPrediction(Prediction):
         self.__transform = transform_fcn
         self.__ut_fcn = ut_fcn
 
+    def __reduce__(self):
+        # data is recalculated (lazily) from the state prediction, so it does not need to be pickled
+        return (LazyUTPrediction, (self.__states, self.__sigma_fcn, self.__ut_fcn, self.__transform))
+
     @property
     def data(self):
         if self.__data == None:
             self.__data = []
+            # If the transformation is a method of a vectorized model (e.g., model.output), it can be applied to every sigma point at once
+            vectorized = getattr(getattr(self.__transform, '__self__', None), 'is_vectorized', False)
             # For each timepoint
             for i in range(len(self.times)):
                 x = self.__states.snapshot(i)
 
                 # Get Sigma points
                 keys = x.keys()
-                mean = [x.mean[key] for key in keys]  # Maintain ordering
+                x_mean = x.mean
+                mean = [x_mean[key] for key in keys]  # Maintain ordering
                 covar = x.cov
                 sigma_pts = self.__sigma_fcn.sigma_points(mean, covar)
                 
                 # Apply Tranformation (e.g., output, event_state)
-                sigma_pt_tranformed = [
-                    self.__transform({key: value for key, value in zip(keys, sigma_pt)})
-                    for sigma_pt in sigma_pts
-                ]
-                # result is [sigma_pt][ -> output/event_state (dict)]
-
-                transformed_keys = sigma_pt_tranformed[0].keys()
-
-                # Flatten 
-                sigma_pt_tranformed = array([array(list(sigma_pt.values())) for sigma_pt in sigma_pt_tranformed]) # map -> array
+                if vectorized:
+                    # Single call with an array of values (one per sigma point) for each key
+                    transformed = self.__transform(dict(zip(keys, sigma_pts.T)))
+                    transformed_keys = transformed.keys()
+                    sigma_pt_tranformed = array([broadcast_to(value, len(sigma_pts)) for value in transformed.values()], dtype=float64).T
+                else:
+                    sigma_pt_tranformed = [
+                        self.__transform(dict(zip(keys, sigma_pt)))
+                        for sigma_pt in sigma_pts
+                    ]
+                    # result is [sigma_pt][ -> output/event_state (dict)]
+
+                    transformed_keys = sigma_pt_tranformed[0].keys()
+
+                    # Flatten 
+                    sigma_pt_tranformed = array([array(list(sigma_pt.values())) for sigma_pt in sigma_pt_tranformed]) # map -> array
 
                 # Apply Unscented Transform to form output distribution
                 mean, cov = self.__ut_fcn(sigma_pt_tranformed, self.__sigma_fcn.Wm, self.__sigma_fcn.Wc)
@@ -108,14 +122,20 @@ class UnscentedTransformPredictor(Predictor):
             self.parameters['Q'] = diag([1.0e-1 for i in range(num_states)])
         
         def measure(x):
-            x = model.StateContainer({key: value for (key, value) in zip(self.__state_keys, x)})
+            x = model.StateContainer(dict(zip(self.__state_keys, x)))
             z = model.output(x)
             return model.OutputContainer({array(list(z.values()))})
 
         def state_transition(x, dt):
-            x = model.StateContainer({key: value for (key, value) in zip(self.__state_keys, x)})
+            if self.__state_keys_in_order:
+                # Sigma point is already a column in the container's order (copied, so the sigma point itself is never modified)
+                x = model.StateContainer(array(x, dtype=float64))
+            else:
+                x = model.StateContainer(dict(zip(self.__state_keys, x)))
             x = model.next_state(x, self.__input, dt)
             x = model.apply_limits(x)
+            if isinstance(x, DictLikeMatrixWrapper):
+                return x.matrix[:, 0]
             return array(list(x.values()))
 
         self.sigma_points = kalman.MerweScaledSigmaPoints(num_states, alpha=self.parameters['alpha'], beta=self.parameters['beta'], kappa=self.parameters['kappa'])
@@ -168,8 +188,8 @@ class UnscentedTransformPredictor(Predictor):
         else:
             raise TypeError("state must be UncertainData, dict, or StateContainer")
 
-        params = deepcopy(self.parameters) # copy parameters
-        params.update(kwargs) # update for specific run
+        # Shallow copy is enough- nested values (e.g., Q, events, save_pts) are only read, never modified
+        params = {**self.parameters, **kwargs} # copy parameters, updated for specific run
 
         if len(params['events']) == 0 and 'horizon' not in params:
             raise ValueError("If specifying no event (i.e., simulate to time), must specify horizon")
@@ -183,16 +203,19 @@ class UnscentedTransformPredictor(Predictor):
         n_points = sigma_points.num_sigmas()
         threshold_met = model.threshold_met
         StateContainer = model.StateContainer
+        vectorized = getattr(model, 'is_vectorized', False)  # If thresholds can be checked for every sigma point at once
 
         # Update State 
-        self.__state_keys = state_keys = state.mean.keys()  # Used to maintain ordering as we strip keys and return
-        filt.x = [x for x in state.mean.values()]
+        state_mean = state.mean
+        self.__state_keys = state_keys = list(state_mean.keys())  # Used to maintain ordering as we strip keys and return
+        self.__state_keys_in_order = state_keys == list(model.states)  # If arrays of state values can be used directly as StateContainers
+        filt.x = fromiter(state_mean.values(), dtype=float64, count=len(state_keys))
         filt.P = state.cov
 
         # Setup first states
         t = params['t0']
         save_pt_index = 0
-        ToE = {key: [float('nan') for i in range(n_points)] for key in events_to_predict}  # Keep track of final ToE values
+        ToE = full((len(events_to_predict), n_points), float('nan'))  # Keep track of final ToE values, as ToE[event_index][sigma_point_index]
         last_state = {key: [None for i in range(n_points)] for key in events_to_predict}  # Keep track of final state values
 
         times = []
@@ -200,8 +223,7 @@ class UnscentedTransformPredictor(Predictor):
         states = []
         save_freq = params['save_freq']
         next_save = t + save_freq
-        save_pts = params['save_pts']
-        save_pts.append(1e99)  # Add last endpoint
+        save_pts = list(params['save_pts']) + [1e99]  # Add last endpoint (on a copy, so the provided list is not modified)
         def update_all():
             times.append(t)
             inputs.append(deepcopy(self.__input))  # Avoid optimization where u is not copied
@@ -209,12 +231,12 @@ class UnscentedTransformPredictor(Predictor):
             states.append(x_dict)  # Avoid optimization where x is not copied
 
         # Simulation
-        self.__input = future_loading_eqn(t, state.mean)
+        self.__input = future_loading_eqn(t, state_mean)
         update_all()  # First State
         while t < params['horizon']:
             # Iterate through time
             t += dt
-            mean_state = StateContainer({key: x for (key, x) in zip(state_keys, filt.x)})
+            mean_state = StateContainer(dict(zip(state_keys, filt.x)))
             self.__input = future_loading_eqn(t, mean_state)
             filt.predict(dt=dt)
 
@@ -228,28 +250,30 @@ class UnscentedTransformPredictor(Predictor):
             
             # Check that any sigma point has hit event
             points = sigma_points.sigma_points(filt.x, filt.P)
-            all_failed = True
-            for i, point in zip(range(n_points), points):
-                x = StateContainer({key: x for (key, x) in zip(state_keys, point)})
-                t_met = threshold_met(x)
-
-                # Check Thresholds
-                for key in events_to_predict:
-                    if t_met[key]:
-                        if isnan(ToE[key][i]):
-                            # First time event has been reached
-                            ToE[key][i] = t
-                            last_state[key][i] = x.copy()
-                    else:
-                        all_failed = False  # This event for this sigma point hasn't been met yet
-            if all_failed:
+            met = empty((len(events_to_predict), n_points), dtype=bool)  # met[event_index][sigma_point_index]
+            if vectorized:
+                # Single state with an array of values (one per sigma point) for each key
+                t_met = threshold_met(StateContainer(dict(zip(state_keys, points.T))))
+                for (event_index, key) in enumerate(events_to_predict):
+                    met[event_index] = t_met[key]
+            else:
+                for (i, point) in enumerate(points):
+                    t_met = threshold_met(StateContainer(dict(zip(state_keys, point))))
+                    met[:, i] = [t_met[key] for key in events_to_predict]
+
+            # Record events reached for the first time
+            first_met = met & isnan(ToE)
+            if first_met.any():
+                ToE[first_met] = t
+                for (event_index, i) in zip(*first_met.nonzero()):
+                    last_state[events_to_predict[event_index]][i] = StateContainer(dict(zip(state_keys, points[i])))
+
+            if met.all():
                 # If all events have been reched for every sigma point
                 break 
         
         # Prepare Results
-        pts = array([[e for e in ToE[key]] for key in ToE.keys()])
-        pts = transpose(pts)
-        mean, cov = kalman.unscented_transform(pts, sigma_points.Wm, sigma_points.Wc)
+        mean, cov = kalman.unscented_transform(ToE.T, sigma_points.Wm, sigma_points.Wc)
 
         # Transform final state into {event_name: MultivariateNormalDist}
         final_state = {}
@@ -268,7 +292,7 @@ class UnscentedTransformPredictor(Predictor):
         state_prediction = Prediction(times, states)
         output_prediction = LazyUTPrediction(state_prediction, sigma_points, kalman.unscented_transform, model.output)
         event_state_prediction = LazyUTPrediction(state_prediction, sigma_points, kalman.unscented_transform, model.event_state)
-        time_of_event = MultivariateNormalDist(ToE.keys(), mean, cov)
+        time_of_event = MultivariateNormalDist(events_to_predict, mean, cov)
         time_of_event.final_state = final_state
         return PredictionResults(
             times, 
@@ -97,6 +97,7 @@ class KalmanFilter(state_estimator.StateEstimator):
         self.filter.R = self.parameters['R']
         self.filter.F = F
         self.filter.B = B
+        self.__discrete_matrices = (None, None, None)  # (dt, F, B) for the last time step. dt is usually constant, so these can be reused
 
     def estimate(self, t : float, u, z):
         """
@@ -133,8 +134,12 @@ class KalmanFilter(state_estimator.StateEstimator):
         # kalman_models is x' = Fx + Bu, where x' is the next state
         # Therefore we need to add the diagnol matrix 1 to A to convert
         # And A and B should be multiplied by the time step
-        B = np.multiply(self.filter.B, dt) 
-        F = np.multiply(self.filter.F, dt) + np.diag([1]* self.model.n_states)
+        (last_dt, F, B) = self.__discrete_matrices
+        if dt != last_dt:
+            B = np.multiply(self.filter.B, dt) 
+            F = np.multiply(self.filter.F, dt)
+            F.flat[::F.shape[1]+1] += 1  # Add 1 to diagonal
+            self.__discrete_matrices = (dt, F, B)
 
         # Predict
         self.filter.predict(u = inputs, B = B, F = F)
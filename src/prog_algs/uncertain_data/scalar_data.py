@@ -75,9 +75,11 @@ class ScalarData(UncertainData):
     def __str__(self) -> str:
         return 'ScalarData({})'.format(self.__state)
 
-    def percentage_in_bounds(self, bounds : Union[list, dict]) -> dict:
+    def percentage_in_bounds(self, bounds : Union[list, dict], keys : list = None) -> dict:
+        if not keys:
+            keys = self.keys()
         if isinstance(bounds, list):
             bounds = {key: bounds for key in self.keys()}
         if not isinstance(bounds, dict) and all([isinstance(b, list) for b in bounds]):
             raise TypeError("Bounds must be list [lower, upper] or dict (key: [lower, upper]), was {}".format(type(bounds)))
-        return {key: (1 if bounds[key][0] < x and bounds[key][1] > x else 0) for (key, x) in self.__state.items()}
+        return {key: (1 if bounds[key][0] < self.__state[key] < bounds[key][1] else 0) for key in keys}
@@ -3,7 +3,7 @@
 from . import UncertainData
 from collections import UserList
 from collections.abc import Iterable
-from numpy import array, cov, random
+from numpy import argmin, array, count_nonzero, cov, einsum, float64, isnan, ndarray, random
 from warnings import warn
 
 from prog_models.utils.containers import DictLikeMatrixWrapper
@@ -111,9 +111,21 @@ class UnweightedSamples(UncertainData, UserList):
         """
         return [sample[key] for sample in self.data if sample is not None]
 
+    def __non_none_values(self, key) -> ndarray:
+        """Values for given key, excluding any that are None"""
+        return array([x for x in self.key(key) if x is not None])
+
     @property
     def median(self) -> dict:
         # Calculate Geometric median of all samples
+        if len(self.data) > 0 and all(datem is not None for datem in self.data):
+            unlabeled_samples = array([list(datem.values()) for datem in self.data], dtype=float64)  # None becomes NaN
+            if unlabeled_samples.ndim == 2 and not isnan(unlabeled_samples).any():
+                # The sample minimizing the total squared distance to all samples is the one closest to their mean
+                deviation = unlabeled_samples - unlabeled_samples.mean(axis=0)
+                return self._type(self[argmin(einsum('ij,ij->i', deviation, deviation))])
+
+        # Some samples or values are None- compare each pair of samples
         min_value = float('inf')
         none_flag = False
         for i, datem in enumerate(self.data):
@@ -135,7 +147,7 @@ class UnweightedSamples(UncertainData, UserList):
     def mean(self) -> dict:
         mean = {}
         for key in self.keys():
-            values = array([x[key] for x in self.data if x is not None and x[key] is not None])
+            values = self.__non_none_values(key)
             if len(values) < len(self.data):
                 warn("Some samples were None, resulting mean is of all non-None samples. Note: in some cases, this will bias the mean result.")
             mean[key] = values.mean()
@@ -145,7 +157,7 @@ class UnweightedSamples(UncertainData, UserList):
     def cov(self) -> dict:
         if len(self.data) == 0:
             return [[]]
-        unlabeled_samples = array([[x[key] for x in self.data if x is not None and x[key] is not None] for key in self.keys()])
+        unlabeled_samples = array([self.__non_none_values(key) for key in self.keys()])
         if len(unlabeled_samples) < len(self.data):
             warn("Some samples were None, resulting covariance is of all non-None samples. Note: in some cases, this will bias the covariance result.")
         return cov(unlabeled_samples)
@@ -170,7 +182,12 @@ class UnweightedSamples(UncertainData, UserList):
         if not isinstance(bounds, dict) or all([isinstance(b, list) and len(b) == 2 for b in bounds]):
             raise TypeError("Bounds must be list [lower, upper] or dict (key: [lower, upper]), was {}".format(type(bounds)))
         n_elements = len(self.data)
-        return {key: sum([x is not None and x < bounds[key][1] and x > bounds[key][0] for x in self.key(key)])/n_elements for key in keys}
+        # Compare all keys at once: one row of values per key, with bounds as columns
+        values = array([self.key(key) for key in keys], dtype=float64).reshape(len(keys), -1)  # None becomes NaN, which is never in bounds
+        lower = array([bounds[key][0] for key in keys], dtype=float64).reshape(-1, 1)
+        upper = array([bounds[key][1] for key in keys], dtype=float64).reshape(-1, 1)
+        n_in_bounds = count_nonzero((values > lower) & (values < upper), axis=1)
+        return {key: n/n_elements for (key, n) in zip(keys, n_in_bounds.tolist())}
 
     def raw_samples(self):
         warn("raw_samples is deprecated and will be removed in the future.")
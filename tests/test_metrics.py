@@ -14,6 +14,15 @@ class TestMetrics(unittest.TestCase):
         self.assertIs(samples.eol_metrics, toe_metrics)
         self.assertIs(samples.prob_success, prob_success)
 
+    def test_mean_square_error(self):
+        from prog_algs.metrics import samples
+        self.assertAlmostEqual(samples.mean_square_error([1, 2, 3], 2), 2/3)
+        self.assertAlmostEqual(samples.root_mean_square_error([1, 2, 3], 2), (2/3)**0.5)
+
+        # Each element is the mean of a list of ToEs
+        self.assertAlmostEqual(samples.mean_square_error([[1, 3], [2, 2]], 1), 1)
+        self.assertAlmostEqual(samples.mean_square_error([[1, 3], [2, 2, 2]], 1), 1)  # Different lengths
+
     def test_toe_metrics_list_dict(self):
         # This is kept for backwards compatability
 
@@ -112,6 +121,11 @@ class TestMetrics(unittest.TestCase):
         self.assertAlmostEqual(metrics['b']['ground truth percentile'], 50, -1)
         self.assertAlmostEqual(metrics['c']['ground truth percentile'], 15.4, -1)
 
+        # Matches scipy.stats.percentileofscore, including ties with ground truth
+        self.assertAlmostEqual(toe_metrics([1, 2, 2, 3], 2)['ground truth percentile'], 62.5)
+        self.assertAlmostEqual(toe_metrics([1, 2, 2, 3], 2.5)['ground truth percentile'], 75)
+        self.assertAlmostEqual(toe_metrics([3, 1, 2, 4, 2, 2], 2)['ground truth percentile'], 50)
+
         # P(success)
         p_success = prob_success(dist, 11)
         self.assertAlmostEqual(p_success['a'], 0.1575, 1)
@@ -274,6 +288,14 @@ class TestMetrics(unittest.TestCase):
         self.assertAlmostEqual(p_success['b'], 0.5)
         self.assertAlmostEqual(p_success['c'], 0)
 
+    def test_toe_metrics_list_types(self):
+        # Integer samples give integer order statistics, as with any other type of sample
+        metrics = toe_metrics([3, None, 1])
+        self.assertEqual(metrics['min'], 1)
+        self.assertNotIsInstance(metrics['min'], float)
+        self.assertNotIsInstance(metrics['max'], float)
+        self.assertEqual(metrics['number of samples'], 2)
+
     def test_toe_metrics_ground_truth(self):
         # Wrong type 
         try:
@@ -392,6 +414,82 @@ class TestMetrics(unittest.TestCase):
         pickle_converted_result = pickle.load(open('predictor_test.pkl', 'rb'))
         self.assertEqual(metrics, pickle_converted_result)
 
+        # Iteration order must follow changes to the profile
+        profile.add_prediction(9.5, UnweightedSamples(data))
+        del profile[10]
+        self.assertListEqual(profile.keys(), [1, 2, 3, 4, 5, 6, 7, 8, 9, 9.5])
+        self.assertListEqual(list(profile), profile.keys())
+        self.assertIs(profile._sorted_times(), profile._sorted_times())  # Shared without copying
+        keys = profile.keys()
+        keys.append(20)  # keys() is a copy, so modifying it does not change the profile
+        self.assertListEqual(list(profile._sorted_times()), [1, 2, 3, 4, 5, 6, 7, 8, 9, 9.5])
+
+        # Copies have their own (correct) order
+        profile_copy = profile.copy()
+        self.assertListEqual(profile_copy.keys(), [1, 2, 3, 4, 5, 6, 7, 8, 9, 9.5])
+        profile_copy.add_prediction(0.5, UnweightedSamples(data))
+        self.assertListEqual(profile_copy.keys(), [0.5, 1, 2, 3, 4, 5, 6, 7, 8, 9, 9.5])
+        self.assertListEqual(profile.keys(), [1, 2, 3, 4, 5, 6, 7, 8, 9, 9.5])
+
+        # Merging with |= updates order and results (Python 3.9+)
+        from collections import UserDict
+        if hasattr(UserDict, '__ior__'):
+            profile_copy = profile.copy()
+            self.assertDictEqual(profile_copy.alpha_lambda(ground_truth, 9.5, alpha, beta), alpha_lambda(profile, ground_truth, 9.5, alpha, beta))
+            bad_prediction = UnweightedSamples([{'a': 100, 'b': 100, 'c': 100}])
+            profile_copy |= {9.5: bad_prediction, 9.75: bad_prediction}
+            self.assertListEqual(profile_copy.keys(), [1, 2, 3, 4, 5, 6, 7, 8, 9, 9.5, 9.75])
+            self.assertDictEqual(profile_copy.alpha_lambda(ground_truth, 9.5, alpha, beta), {'a': False, 'b': False, 'c': False})
+        else:
+            with self.assertRaises(TypeError):
+                profile_copy = profile.copy()
+                profile_copy |= {9.75: UnweightedSamples(data)}
+
+        # No prediction at or after lambda
+        self.assertIsNone(alpha_lambda(profile, ground_truth, 11, alpha, beta))
+
+        # Other dict-like profiles (sorted by time of prediction) are supported
+        self.assertDictEqual(alpha_lambda(dict(profile.items()), ground_truth, lambda_value, alpha, beta), alpha_lambda(profile, ground_truth, lambda_value, alpha, beta))
+
+        # Combined result
+        self.assertEqual(alpha_lambda(profile, ground_truth, lambda_value, alpha, beta, return_combined=True), all(metrics.values()))
+        self.assertFalse(alpha_lambda(profile, ground_truth, lambda_value, alpha, 1, return_combined=True))
+
+        # Combined result for sampled distributions draws samples once, not once per key
+        class CountingDist(MultivariateNormalDist):
+            n_sample_calls = 0
+            def sample(self, num_samples = 1):
+                CountingDist.n_sample_calls += 1
+                return super().sample(num_samples)
+        dist_profile = ToEPredictionProfile({1: CountingDist(['a', 'b', 'c', 'd'], [10, 10, 10, 10], [[0.1, 0, 0, 0], [0, 0.1, 0, 0], [0, 0, 0.1, 0], [0, 0, 0, 0.1]])})
+        self.assertTrue(alpha_lambda(dist_profile, {'a': 10, 'b': 10, 'c': 10, 'd': 10}, 1, 0.5, 0.5, return_combined=True))
+        self.assertEqual(CountingDist.n_sample_calls, 1)
+
+        # Method results are cached until the profile changes
+        metrics = profile.alpha_lambda(ground_truth, lambda_value, alpha, beta)
+        self.assertDictEqual(metrics, alpha_lambda(profile, ground_truth, lambda_value, alpha, beta))
+        metrics['a'] = None  # Modifying a result does not modify the cache
+        self.assertDictEqual(profile.alpha_lambda(ground_truth, lambda_value, alpha, beta), alpha_lambda(profile, ground_truth, lambda_value, alpha, beta))
+        profile.add_prediction(lambda_value, UnweightedSamples([{'a': 100, 'b': 100, 'c': 100}]))
+        self.assertDictEqual(profile.alpha_lambda(ground_truth, lambda_value, alpha, beta), {'a': False, 'b': False, 'c': False})
+
+        # Caches are not shared between profiles
+        profile1 = ToEPredictionProfile({1: UnweightedSamples([{'a': 9}])})
+        profile2 = ToEPredictionProfile({1: UnweightedSamples([{'a': 100}])})
+        self.assertDictEqual(profile1.alpha_lambda({'a': 9}, 1, 0.2, 0.5), {'a': True})
+        self.assertDictEqual(profile2.alpha_lambda({'a': 9}, 1, 0.2, 0.5), {'a': False})
+
+        # Number of cached results is limited
+        for i in range(100):
+            profile1.prognostic_horizon(lambda toe, gt: {'a': True}, {'a': 9})
+        self.assertLessEqual(len(profile1._ToEPredictionProfile__metric_cache), 16)
+
+        # Cached results (including those keyed by functions) are not pickled
+        import pickle
+        profile1_unpickled = pickle.loads(pickle.dumps(profile1))
+        self.assertEqual(profile1_unpickled, profile1)
+        self.assertDictEqual(profile1_unpickled.alpha_lambda({'a': 9}, 1, 0.2, 0.5), {'a': True})
+
     def test_toe_profile_prognostic_horizon(self):
         from prog_algs.predictors import ToEPredictionProfile
         profile = ToEPredictionProfile()  # Empty profile
@@ -458,6 +556,11 @@ class TestMetrics(unittest.TestCase):
         # Test negative floats ground truth
         GROUND_TRUTH = {'a': -9.0, 'b': -8.0, 'c': -18.0}
         self.assertEqual(profile.cumulative_relative_accuracy(GROUND_TRUTH), {'a': 3.555555555555556, 'b': 3.625, 'c': 3.305555555555556})
+        # Result is recalculated when profile changes
+        profile.add_prediction(11, UnweightedSamples([{'a': -9.0, 'b': -8.0, 'c': -18.0}]))
+        self.assertEqual(profile.cumulative_relative_accuracy(GROUND_TRUTH), {'a': 3.3232323232323235, 'b': 3.3863636363636362, 'c': 3.095959595959596})
+        del profile[11]
+        self.assertEqual(profile.cumulative_relative_accuracy(GROUND_TRUTH), {'a': 3.555555555555556, 'b': 3.625, 'c': 3.305555555555556})
         # Test ground truth values of 0; already caught by relative_accuracy
         with self.assertRaises(ZeroDivisionError):
             GROUND_TRUTH = {'a': 0, 'b': 0, 'c': 0}
@@ -72,6 +72,19 @@ class TestPredictors(unittest.TestCase):
         mc_results = pred.predict(samples, future_loading, dt=0.01, save_freq=1)
         self.assertAlmostEqual(mc_results.time_of_event.mean['impact'], 8.21, 0)
         self.assertAlmostEqual(mc_results.time_of_event.mean['falling'], 4.15, 0)
+
+        # Thresholds are checked and outputs calculated for one sigma point at a time when model is not vectorized- same result
+        output_means = [z.mean for z in mc_results.outputs.data]
+        event_state_means = [es.mean for es in mc_results.event_states.data]
+        m.is_vectorized = False
+        results_not_vectorized = pred.predict(samples, future_loading, dt=0.01, save_freq=1)
+        for (z, z_mean) in zip(results_not_vectorized.outputs.data, output_means):
+            self.assertAlmostEqual(z.mean['x'], z_mean['x'])
+        for (es, es_mean) in zip(results_not_vectorized.event_states.data, event_state_means):
+            self.assertAlmostEqual(es.mean['falling'], es_mean['falling'])
+            self.assertAlmostEqual(es.mean['impact'], es_mean['impact'])
+        self.assertDictEqual(results_not_vectorized.time_of_event.mean, mc_results.time_of_event.mean)
+        self.assertEqual(results_not_vectorized.time_of_event.final_state['impact'].mean, mc_results.time_of_event.final_state['impact'].mean)
         # self.assertAlmostEqual(mc_results.times[-1], 9, 1)  # Saving every second, last time should be around the 1s after impact event (because one of the sigma points fails afterwards)
 
     def test_UTP_ThrownObject_One_Event(self):
@@ -87,6 +100,13 @@ class TestPredictors(unittest.TestCase):
         self.assertTrue('impact' not in mc_results.time_of_event.mean)
         self.assertAlmostEqual(mc_results.times[-1], 4, 1)  # Saving every second, last time should be around the nearest 1s before falling event
 
+        # Provided save points are not modified
+        save_pts = [1.5, 2.5]
+        mc_results = pred.predict(samples, future_loading, dt=0.01, events=['falling'], save_freq=1, save_pts=save_pts)
+        self.assertListEqual(save_pts, [1.5, 2.5])
+        self.assertIn(1.5, [round(t, 2) for t in mc_results.times])
+        self.assertListEqual(pred.parameters['save_pts'], [])
+
     def test_UKP_Battery(self):
         def future_loading(t, x = None):
             # Variable (piece-wise) future loading scheme 
@@ -131,6 +151,40 @@ class TestPredictors(unittest.TestCase):
             
         mc.predict(m.initialize(), future_loading, dt=0.2, num_samples=3, save_freq=1)
 
+        # Prediction starting at t0
+        mc_results = mc.predict(m.initialize(), future_loading, dt=0.2, n_samples=3, save_freq=1, t0=5)
+        self.assertEqual(mc_results.times[0], 5)
+        self.assertGreater(mc_results.time_of_event.mean['impact'], 5)
+
+        # Horizon applies to the whole prediction, not each event
+        mc_results = mc.predict(m.initialize(), future_loading, dt=0.2, n_samples=3, horizon=5)
+        self.assertLess(mc_results.time_of_event[0]['falling'], 5)
+        self.assertIsNone(mc_results.time_of_event[0]['impact'])
+
+    def test_MC_multiprocessing(self):
+        m = ThrownObject()
+        mc = MonteCarlo(m)
+        def future_loading(t = None, x = None):
+            return m.InputContainer({})
+
+        x = UnweightedSamples([m.initialize()]*10)
+        serial = mc.predict(x, future_loading, dt=0.2, n_samples=10, save_freq=1)
+        parallel = mc.predict(x, future_loading, dt=0.2, n_samples=10, save_freq=1, cores=2)
+        self.assertListEqual(serial.times, parallel.times)
+        self.assertListEqual(serial.time_of_event.key('impact'), parallel.time_of_event.key('impact'))
+
+        # Results are the same types, regardless of the number of cores
+        for (result_serial, result_parallel) in [(serial.inputs, parallel.inputs), (serial.states, parallel.states), (serial.outputs, parallel.outputs), (serial.event_states, parallel.event_states)]:
+            self.assertIs(type(result_serial[0]), type(result_parallel[0]))
+            self.assertIs(type(result_serial[0][0]), type(result_parallel[0][0]))
+        self.assertIsInstance(parallel.inputs[0][0], m.InputContainer)
+        self.assertIs(type(serial.time_of_event.final_state['impact'][0]), type(parallel.time_of_event.final_state['impact'][0]))
+        self.assertEqual(serial.outputs[0][-1], parallel.outputs[0][-1])
+
+        # All available cores
+        parallel = mc.predict(x, future_loading, dt=0.2, n_samples=10, save_freq=1, cores=None)
+        self.assertListEqual(serial.time_of_event.key('impact'), parallel.time_of_event.key('impact'))
+
     def test_prediction_mvnormaldist(self):
         times = list(range(10))
         covar = [[0.1, 0.01], [0.01, 0.1]]
@@ -168,6 +222,23 @@ class TestPredictors(unittest.TestCase):
         self.assertEqual(p.time(0), times[0])
         self.assertEqual(p.times[0], times[0])
         self.assertEqual(p.time(-1), times[-1])
+        self.assertListEqual(p.mean, [{'a': i} for i in range(10)])
+        self.assertListEqual(list(p.snapshot(5).key('a')), [5, 6, 4])
+        self.assertEqual(p.snapshot(5).median, {'a': 5})
+
+        # Data points with keys in different orders
+        p_ordered = UnweightedSamplesPrediction([0, 1], [[{'a': 1, 'b': 2}, {'a': 3, 'b': 4}], [{'b': 6, 'a': 5}, {'b': 8, 'a': 7}]])
+        self.assertListEqual(p_ordered.mean, [{'a': 3, 'b': 4}, {'a': 5, 'b': 6}])
+        self.assertListEqual(p_ordered.snapshot(1).key('b'), [4, 8])
+
+        # Samples of different lengths
+        p = UnweightedSamplesPrediction(times, [states[0], UnweightedSamples([{'a': i} for i in range(5)])])
+        self.assertEqual(p.mean[0], {'a': 0})
+        self.assertEqual(p.mean[-1], {'a': 9})
+        self.assertEqual(p.snapshot(-1), UnweightedSamples([{'a': 9}, None]))
+        self.assertListEqual(list(p.snapshot(0).key('a')), [0, 0])
+
+        p = UnweightedSamplesPrediction(times, states)
 
         # Out of range
         try:
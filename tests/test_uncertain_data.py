@@ -50,6 +50,12 @@ class TestUncertainData(unittest.TestCase):
         self.assertEqual(data.percentage_in_bounds({'a': [0, 2.5], 'b': [0, 1.5]}), 
             {'a':0.6, 'b': 0.2})
 
+    def test_unweightedsamples_key(self):
+        s = UnweightedSamples([{'a': 1, 'b': 2}, None, {'a': 3, 'b': None}])
+        self.assertListEqual(s.key('a'), [1, 3])
+        self.assertListEqual(s.key('b'), [2, None])
+        self.assertIsInstance(UnweightedSamples({'a': array([1, 2])}).key('a'), list)  # Same type for any values
+
     def test_multivariatenormaldist(self):
         try: 
             dist = MultivariateNormalDist()
@@ -74,6 +80,7 @@ class TestUncertainData(unittest.TestCase):
         self.assertEqual(d.percentage_in_bounds([13, 20]), {'a': 0, 'b': 1})
         self.assertEqual(d.percentage_in_bounds([0, 10]), {'a': 0, 'b': 0})
         self.assertEqual(d.percentage_in_bounds([0, 20]), {'a': 1, 'b': 1})
+        self.assertEqual(d.percentage_in_bounds({'b': [13, 20]}, keys=['b']), {'b': 1})
 
     def test_pickle_unweightedsamples(self):
         data = {'a': 12, 'b': 14}